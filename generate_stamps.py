@@ -31,12 +31,17 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
         action="store_true",
         help="Skip generating the set icon asset even if defined by the config.",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always re-parse the config instead of using the on-disk parse cache.",
+    )
     return parser.parse_args(argv)
 
 
 def main(argv: list[str] | None = None) -> int:
     args = parse_args(argv or sys.argv[1:])
-    config, base_dir = load_config(args.config)
+    config, base_dir = load_config(args.config, use_cache=not args.no_cache)
 
     if args.font:
         config.font_path = Path(args.font)
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import hashlib
 import json
-from dataclasses import dataclass
+import pickle
+from dataclasses import dataclass, fields
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
@@ -90,6 +92,11 @@ class StickerSpec:
         return cls(**data)
 
 
+# Multiplier the spec's pixel fields (font_size, padding, offsets, ...)
+# have historically been denominated in.
+_SPEC_REFERENCE_SCALE = 4
+
+
 @dataclass(slots=True)
 class GenerationConfig:
     stickers: List[StickerSpec]
@@ -99,11 +106,13 @@ class GenerationConfig:
     main_size: Tuple[int, int] = (370, 320)
     tab_size: Tuple[int, int] = (96, 74)
     store_size: Tuple[int, int] = (240, 240)
-    scale_multiplier: int = 4
+    scale_multiplier: int = 2
     set_icon_text: Optional[str] = None
     set_icon_background: str = "#FFFFFF"
     set_icon_text_color: str = "#000000"
     set_icon_font_size: Optional[int] = None
+    png_compress_level: int = 1
+    postprocess_png: bool = False
 
     def __post_init__(self) -> None:
         if isinstance(self.output_dir, (str, Path)):
@@ -114,12 +123,24 @@ class GenerationConfig:
         self.main_size = _as_tuple(self.main_size, 2, (370, 320))  # type: ignore[arg-type]
         self.tab_size = _as_tuple(self.tab_size, 2, (96, 74))  # type: ignore[arg-type]
         self.store_size = _as_tuple(self.store_size, 2, (240, 240))  # type: ignore[arg-type]
-        self.scale_multiplier = max(2, int(self.scale_multiplier))
+        self.scale_multiplier = max(1, int(self.scale_multiplier))
+        self.png_compress_level = max(0, min(9, int(self.png_compress_level)))
+        self.postprocess_png = bool(self.postprocess_png)
 
     @property
     def base_size(self) -> Tuple[int, int]:
         return (self.main_size[0] * self.scale_multiplier, self.main_size[1] * self.scale_multiplier)
 
+    @property
+    def spec_scale(self) -> float:
+        """Factor mapping spec pixel values onto the render canvas.
+
+        Pixel-denominated fields are interpreted on the historical 4x
+        supersampled canvas; scaling them by this factor keeps the rendered
+        layout identical whatever ``scale_multiplier`` is set to.
+        """
+        return self.scale_multiplier / _SPEC_REFERENCE_SCALE
+
 
 def _load_json(path: Path) -> Dict[str, Any]:
     return json.loads(path.read_text(encoding="utf-8"))
@@ -137,10 +158,59 @@ def _load_yaml(path: Path) -> Dict[str, Any]:
     return loaded
 
 
-def load_config(path: Path | str) -> Tuple[GenerationConfig, Path]:
+def _config_schema() -> str:
+    names = [field.name for field in fields(GenerationConfig)]
+    names += [field.name for field in fields(StickerSpec)]
+    names += [field.name for field in fields(IllustrationSpec)]
+    return ",".join(names)
+
+
+def _cache_dir() -> Path:
+    # Unpickling is code execution, so the cache must live somewhere other
+    # users cannot write to: a 0700 directory under the user's home, not a
+    # shared location like the system temp dir.
+    return Path.home() / ".cache" / "line_stamp"
+
+
+def _cache_path(path_obj: Path) -> Path:
+    stat = path_obj.stat()
+    cache_key = f"{path_obj.resolve()}:{stat.st_mtime_ns}:{stat.st_size}:{_config_schema()}"
+    digest = hashlib.blake2b(cache_key.encode("utf-8"), digest_size=16).hexdigest()
+    return _cache_dir() / f"{digest}.pkl"
+
+
+def _load_cached_config(cache_file: Path) -> Optional[GenerationConfig]:
+    if not cache_file.exists():
+        return None
+    try:
+        with cache_file.open("rb") as handle:
+            cached = pickle.load(handle)
+    except Exception:  # stale or corrupt cache falls back to parsing
+        return None
+    return cached if isinstance(cached, GenerationConfig) else None
+
+
+def _store_cached_config(cache_file: Path, config: GenerationConfig) -> None:
+    try:
+        cache_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        with cache_file.open("wb") as handle:
+            pickle.dump(config, handle)
+    except OSError:  # caching is best-effort
+        pass
+
+
+def load_config(path: Path | str, use_cache: bool = True) -> Tuple[GenerationConfig, Path]:
     path_obj = Path(path)
     if not path_obj.exists():
         raise FileNotFoundError(f"Config file not found: {path_obj}")
+    base_dir = path_obj.parent.resolve()
+
+    cache_file = _cache_path(path_obj) if use_cache else None
+    if cache_file is not None:
+        cached = _load_cached_config(cache_file)
+        if cached is not None:
+            return cached, base_dir
+
     suffix = path_obj.suffix.lower()
     if suffix == ".json":
         raw_config = _load_json(path_obj)
@@ -156,4 +226,6 @@ def load_config(path: Path | str) -> Tuple[GenerationConfig, Path]:
     cfg_kwargs: Dict[str, Any] = {key: value for key, value in raw_config.items() if key != "stickers"}
     cfg_kwargs["stickers"] = stickers
     config = GenerationConfig(**cfg_kwargs)
-    return config, path_obj.parent.resolve()
+    if cache_file is not None:
+        _store_cached_config(cache_file, config)
+    return config, base_dir
@@ -1,13 +1,24 @@
 from __future__ import annotations
 
+import atexit
+import functools
+import json
 import math
+import os
+import re
+import shutil
+import subprocess
 import unicodedata
+from bisect import bisect_right
+from itertools import accumulate
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional, Sequence, Tuple
 
 from PIL import Image, ImageDraw, ImageFont, ImageOps
+from PIL import PngImagePlugin  # noqa: F401 - register the PNG plugin before the hot save loop
 
-from .config import GenerationConfig, IllustrationSpec, StickerSpec
+from .config import GenerationConfig, IllustrationSpec, StickerSpec, _SPEC_REFERENCE_SCALE
 
 DEFAULT_FONT_CANDIDATES: Sequence[Path] = (
     Path("C:/Windows/Fonts/YuGothR.ttc"),
@@ -22,6 +33,18 @@ DEFAULT_FONT_CANDIDATES: Sequence[Path] = (
 )
 
 
+@functools.lru_cache(maxsize=1)
+def _default_font_path() -> Optional[Path]:
+    for candidate in DEFAULT_FONT_CANDIDATES:
+        if candidate.exists():
+            return candidate
+    return None
+
+
+_HEX_COLOR_RE = re.compile(r"[0-9a-fA-F]{8}")
+
+
+@functools.lru_cache(maxsize=256)
 def _parse_color(value: str) -> Tuple[int, int, int, int]:
     raw = value.strip()
     if not raw.startswith("#"):
@@ -31,58 +54,230 @@ def _parse_color(value: str) -> Tuple[int, int, int, int]:
         raw = "".join(ch * 2 for ch in raw)
     if len(raw) == 6:
         raw += "FF"
-    if len(raw) != 8:
+    # int(raw, 16) alone would accept underscores and whitespace.
+    if not _HEX_COLOR_RE.fullmatch(raw):
         raise ValueError(f"Invalid hex color: {value}")
-    r = int(raw[0:2], 16)
-    g = int(raw[2:4], 16)
-    b = int(raw[4:6], 16)
-    a = int(raw[6:8], 16)
-    return (r, g, b, a)
+    packed = int(raw, 16)
+    return (packed >> 24 & 0xFF, packed >> 16 & 0xFF, packed >> 8 & 0xFF, packed & 0xFF)
+
+
+_WORKER_GENERATOR: Optional["StickerGenerator"] = None
+
+
+def _init_worker(config: GenerationConfig, base_dir: Path) -> None:
+    global _WORKER_GENERATOR
+    _WORKER_GENERATOR = StickerGenerator(config, base_dir=base_dir)
+    # Workers hand their measurements back through _render_sticker's return
+    # value; their atexit flush never fires under the fork start method, so
+    # drop it rather than depend on it.
+    atexit.unregister(_WORKER_GENERATOR._flush_measurement_cache)
+
+
+def _render_sticker(
+    item: Tuple[int, StickerSpec],
+) -> Tuple[dict[Tuple[int, str], int], dict[Tuple[str, int, int, int, float], Tuple[int, List[str], int, int]]]:
+    index, spec = item
+    assert _WORKER_GENERATOR is not None
+    _WORKER_GENERATOR._render_and_export(spec, index)
+    _WORKER_GENERATOR._drain_io()
+    return _WORKER_GENERATOR._measurement_entries()
+
+
+_SLUG_SEPARATORS = str.maketrans({" ": "-", "_": "-"})
+_SLUG_DROP_RE = re.compile(r"[^\w-]+")
+_SLUG_DASH_RE = re.compile(r"-{2,}")
 
 
 def _slugify(source: str) -> str:
-    normalized = unicodedata.normalize("NFKD", source)
-    ascii_only = []
-    for char in normalized:
-        if char.isalnum():
-            ascii_only.append(char.lower())
-        elif char in (" ", "-", "_"):
-            ascii_only.append("-")
-    slug = "".join(ascii_only)
-    while "--" in slug:
-        slug = slug.replace("--", "-")
-    return slug.strip("-_ ")
+    normalized = unicodedata.normalize("NFKD", source).lower()
+    slug = _SLUG_DROP_RE.sub("", normalized.translate(_SLUG_SEPARATORS))
+    return _SLUG_DASH_RE.sub("-", slug).strip("-_ ")
 
 
 class StickerGenerator:
+    _LENGTH_CACHE_LIMIT = 4096
+
     def __init__(self, config: GenerationConfig, base_dir: Optional[Path] = None) -> None:
         self.config = config
         self.base_dir = Path(base_dir or Path.cwd())
         self.output_dir = (self.base_dir / self.config.output_dir).resolve()
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._category_dirs: dict[str, Path] = {}
+        for category in ("main", "store", "tab", "set_icon"):
+            target_dir = self.output_dir / category
+            target_dir.mkdir(parents=True, exist_ok=True)
+            self._category_dirs[category] = target_dir
 
+        self._resolved_path_cache: dict[str, Path] = {}
         self._font_path = self._resolve_font_path()
+        self._font_cache: dict[int, ImageFont.FreeTypeFont | ImageFont.ImageFont] = {}
+        self._advance_cache: dict[Tuple[int, str], int] = {}
+        self._metrics_cache: dict[int, int] = {}
+        self._length_cache: dict[Tuple[int, str], int] = {}
+        self._layout_cache: dict[
+            Tuple[str, int, int, int, float],
+            Tuple[ImageFont.FreeTypeFont | ImageFont.ImageFont, List[str], int, int],
+        ] = {}
+        self._line_mask_cache: dict[Tuple[int, str], Tuple[Image.Image, int, int]] = {}
+        self._scratch_canvas: Optional[Image.Image] = None
+        self._image_cache: dict[Path, Image.Image] = {}
+        self._bg_fit_cache: dict[Tuple[Path, Tuple[int, int]], Image.Image] = {}
+        self._illustration_cache: dict[Tuple[str, str, str, Optional[str], str, int], Image.Image] = {}
+        self._io_pool = ThreadPoolExecutor(max_workers=4)
+        self._io_futures: List[Future] = []
         self._measure_image = Image.new("RGBA", (10, 10))
         self._measure_draw = ImageDraw.Draw(self._measure_image)
 
+        self._font_sizes: dict[int, int] = {}
+        self._persist_lengths: dict[Tuple[int, str], int] = {}
+        self._persist_layouts: dict[Tuple[str, int, int, int, float], Tuple[int, List[str], int, int]] = {}
+        self._persist_dirty = False
+        self._load_measurement_cache()
+        atexit.register(self._flush_measurement_cache)
+
     def generate_all(self) -> None:
-        for index, spec in enumerate(self.config.stickers, start=1):
-            base_image = self._render_base(spec)
-            slug = self._ensure_slug(spec, index)
-            self._export_scaled(base_image, slug, "main", self.config.main_size)
-            self._export_scaled(base_image, slug, "store", self.config.store_size)
-            self._export_scaled(base_image, slug, "tab", self.config.tab_size)
+        items = list(enumerate(self.config.stickers, start=1))
+        max_workers = min(os.cpu_count() or 1, len(items))
+        if max_workers > 1:
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_worker,
+                initargs=(self.config, self.base_dir),
+            ) as executor:
+                for lengths, layouts in executor.map(_render_sticker, items):
+                    if lengths or layouts:
+                        self._persist_lengths.update(lengths)
+                        self._persist_layouts.update(layouts)
+                        self._persist_dirty = True
+        else:
+            for index, spec in items:
+                self._render_and_export(spec, index)
+        self._drain_io()
 
         if self.config.set_icon_text:
             self._generate_set_icon(self.config.set_icon_text)
 
+        if self.config.postprocess_png:
+            self._postprocess_pngs()
+
+        self._flush_measurement_cache()
+
+    def _measurement_cache_path(self) -> Path:
+        return self.output_dir / ".cache" / "measurements.json"
+
+    def _font_signature(self) -> List:
+        if self._font_path and self._font_path.exists():
+            return [str(self._font_path), self._font_path.stat().st_mtime_ns]
+        return ["", 0]
+
+    def _read_measurement_file(
+        self,
+    ) -> Tuple[dict[Tuple[int, str], int], dict[Tuple[str, int, int, int, float], Tuple[int, List[str], int, int]]]:
+        lengths: dict[Tuple[int, str], int] = {}
+        layouts: dict[Tuple[str, int, int, int, float], Tuple[int, List[str], int, int]] = {}
+        try:
+            raw = json.loads(self._measurement_cache_path().read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return lengths, layouts
+        if not isinstance(raw, dict) or raw.get("font") != self._font_signature():
+            return lengths, layouts
+        try:
+            for size, text, length in raw.get("lengths", []):
+                lengths[(int(size), text)] = int(length)
+            for text, max_width, max_height, base_size, spacing, size, lines, line_height, line_gap in raw.get(
+                "layouts", []
+            ):
+                key = (text, int(max_width), int(max_height), int(base_size), float(spacing))
+                layouts[key] = (int(size), list(lines), int(line_height), int(line_gap))
+        except (TypeError, ValueError):
+            lengths.clear()
+            layouts.clear()
+        return lengths, layouts
+
+    def _load_measurement_cache(self) -> None:
+        lengths, layouts = self._read_measurement_file()
+        self._persist_lengths.update(lengths)
+        self._persist_layouts.update(layouts)
+
+    def _measurement_entries(
+        self,
+    ) -> Tuple[dict[Tuple[int, str], int], dict[Tuple[str, int, int, int, float], Tuple[int, List[str], int, int]]]:
+        """Measurements for the parent to merge; empty when nothing changed."""
+        if not self._persist_dirty:
+            return {}, {}
+        return self._persist_lengths, self._persist_layouts
+
+    def _flush_measurement_cache(self) -> None:
+        if not self._persist_dirty:
+            return
+        # Pool workers flush their own entries when they exit; merge with the
+        # current file contents so the last writer does not discard them.
+        lengths, layouts = self._read_measurement_file()
+        lengths.update(self._persist_lengths)
+        layouts.update(self._persist_layouts)
+        self._persist_lengths = lengths
+        self._persist_layouts = layouts
+        payload = {
+            "font": self._font_signature(),
+            "lengths": [[size, text, length] for (size, text), length in self._persist_lengths.items()],
+            "layouts": [
+                [*key, size, lines, line_height, line_gap]
+                for key, (size, lines, line_height, line_gap) in self._persist_layouts.items()
+            ],
+        }
+        cache_path = self._measurement_cache_path()
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_text(json.dumps(payload), encoding="utf-8")
+        except OSError:  # persistence is best-effort
+            return
+        self._persist_dirty = False
+
+    def _postprocess_pngs(self) -> None:
+        oxipng = shutil.which("oxipng")
+        if oxipng is None:
+            print("postprocess_png is enabled but oxipng was not found on PATH; skipping")
+            return
+        paths = [str(path) for path in sorted(self.output_dir.rglob("*.png"))]
+        if paths:
+            subprocess.run([oxipng, "-o", "2", "--strip", "safe", *paths], check=False)
+
+    def _drain_io(self) -> None:
+        futures, self._io_futures = self._io_futures, []
+        for future in futures:
+            future.result()
+
+    def _render_and_export(self, spec: StickerSpec, index: int) -> None:
+        base_image = self._render_base(spec)
+        slug = self._ensure_slug(spec, index)
+        targets = [
+            ("main", self.config.main_size),
+            ("store", self.config.store_size),
+            ("tab", self.config.tab_size),
+        ]
+        targets.sort(key=lambda item: item[1][0] * item[1][1], reverse=True)
+        previous = base_image
+        for category, size in targets:
+            source = previous if self._ratio_matches(previous, size) else base_image
+            resized = self._export_scaled(source, slug, category, size)
+            if resized is not None:
+                previous = resized
+
+    @staticmethod
+    def _ratio_matches(image: Image.Image, size: Tuple[int, int]) -> bool:
+        if size[0] <= 0 or size[1] <= 0:
+            return False
+        return abs(image.width / image.height - size[0] / size[1]) <= 0.01
+
     def _render_base(self, spec: StickerSpec) -> Image.Image:
         width, height = self.config.base_size
         background = self._compose_background(spec, (width, height))
         draw = ImageDraw.Draw(background)
 
-        available_width = width - spec.padding * 2
-        available_height = height - spec.padding * 2
+        spec_scale = self.config.spec_scale
+        padding = round(spec.padding * spec_scale)
+        available_width = width - padding * 2
+        available_height = height - padding * 2
         has_art = bool(spec.image_path or (spec.illustration and spec.illustration.enabled))
         image_reserved_height = int(available_height * spec.image_area_ratio) if has_art else 0
         text_box_height = max(available_height - image_reserved_height, int(available_height * 0.35))
@@ -90,15 +285,16 @@ class StickerGenerator:
             spec.text,
             available_width,
             text_box_height,
-            self.config.font_size,
+            max(1, round(self.config.font_size * spec_scale)),
             spec.line_spacing,
         )
 
         text_block_height = self._block_height(len(lines), line_height, line_gap)
-        text_top = spec.padding + max(0, (text_box_height - text_block_height) // 2)
-        text_left = spec.padding
+        text_top = padding + max(0, (text_box_height - text_block_height) // 2)
+        text_left = padding
 
         self._draw_text_block(
+            background,
             draw,
             lines,
             font,
@@ -118,25 +314,62 @@ class StickerGenerator:
                 art_image,
                 available_width,
                 height,
-                spec.padding,
+                padding,
                 text_bottom,
-                spec.image_bottom_margin,
+                round(spec.image_bottom_margin * spec_scale),
             )
 
         return background
 
+    @staticmethod
+    def _spec_is_opaque(spec: StickerSpec) -> bool:
+        """True when every color in the spec is fully opaque.
+
+        Such stickers can be composed in RGB, halving the bytes every blend
+        and resize touches, without changing the rendered pixels.
+        """
+        if spec.background_image:
+            return False
+        colors = (spec.background_color, spec.text_color, spec.text_shadow_color, spec.text_stroke_color)
+        return all(color is None or _parse_color(color)[3] == 255 for color in colors)
+
     def _compose_background(self, spec: StickerSpec, size: Tuple[int, int]) -> Image.Image:
         width, height = size
+        mode = "RGB" if self._spec_is_opaque(spec) else "RGBA"
         base_color = _parse_color(spec.background_color)
-        canvas = Image.new("RGBA", (width, height), base_color)
+        if mode == "RGB":
+            base_color = base_color[:3]
+        canvas = self._scratch_canvas
+        if canvas is not None and canvas.size == size and canvas.mode == mode:
+            canvas.paste(base_color, (0, 0, width, height))
+        else:
+            canvas = Image.new(mode, (width, height), base_color)
+            self._scratch_canvas = canvas
 
         if spec.background_image:
             path = self._resolve_path(spec.background_image)
-            with Image.open(path) as bg:
-                background = ImageOps.fit(bg.convert("RGBA"), (width, height), Image.LANCZOS)
+            fit_key = (path, size)
+            background = self._bg_fit_cache.get(fit_key)
+            if background is None:
+                background = ImageOps.fit(self._load_image(path), (width, height), Image.LANCZOS)
+                self._bg_fit_cache[fit_key] = background
             canvas.alpha_composite(background)
         return canvas
 
+    def _load_image(self, path: Path) -> Image.Image:
+        cached = self._image_cache.get(path)
+        if cached is None:
+            with Image.open(path) as source:
+                if source.format == "JPEG":
+                    # Let libjpeg downscale in the DCT domain during decode;
+                    # draft never shrinks below twice the compose size, so the
+                    # later LANCZOS fit keeps its quality margin.
+                    width, height = self.config.base_size
+                    source.draft("RGB", (width * 2, height * 2))
+                cached = source.convert("RGBA")
+            self._image_cache[path] = cached
+        return cached
+
     def _composite_art(
         self,
         canvas: Image.Image,
@@ -157,10 +390,14 @@ class StickerGenerator:
         horizontal_margin = (text_width - art_rgba.width) // 2
         x_pos = padding + max(0, horizontal_margin)
         y_pos = full_height - padding - bottom_margin - art_rgba.height
-        canvas.alpha_composite(art_rgba, dest=(x_pos, y_pos))
+        if canvas.mode == "RGBA":
+            canvas.alpha_composite(art_rgba, dest=(x_pos, y_pos))
+        else:
+            canvas.paste(art_rgba, (x_pos, y_pos), art_rgba)
 
     def _draw_text_block(
         self,
+        canvas: Image.Image,
         draw: ImageDraw.ImageDraw,
         lines: List[str],
         font: ImageFont.FreeTypeFont | ImageFont.ImageFont,
@@ -171,28 +408,93 @@ class StickerGenerator:
         line_gap: int,
         spec: StickerSpec,
     ) -> None:
+        text_fill: Tuple[int, ...] = _parse_color(spec.text_color)
+        shadow_fill: Optional[Tuple[int, ...]] = (
+            _parse_color(spec.text_shadow_color) if spec.text_shadow_color else None
+        )
+        stroke_fill: Optional[Tuple[int, ...]] = (
+            _parse_color(spec.text_stroke_color) if spec.text_stroke_color else None
+        )
+        if canvas.mode != "RGBA":
+            text_fill = text_fill[:3]
+            shadow_fill = shadow_fill[:3] if shadow_fill else None
+            stroke_fill = stroke_fill[:3] if stroke_fill else None
+        spec_scale = self.config.spec_scale
+        offset_x = round(spec.text_shadow_offset[0] * spec_scale)
+        offset_y = round(spec.text_shadow_offset[1] * spec_scale)
+        stroke_width = (
+            max(1, round(spec.text_stroke_width * spec_scale)) if spec.text_stroke_width > 0 else 0
+        )
+        fuse_shadow = shadow_fill is not None and stroke_width <= 0
         y = top
         for line in lines:
             text_width = self._text_length(line, font)
             x = left + max(0, (width - text_width) // 2)
-            if spec.text_shadow_color:
-                offset_x, offset_y = spec.text_shadow_offset
+            if fuse_shadow:
+                if self._paste_shadowed_line(
+                    canvas, line, font, (x, y), (offset_x, offset_y), text_fill, shadow_fill
+                ):
+                    y += line_height + line_gap
+                    continue
+            if shadow_fill is not None:
                 draw.text(
                     (x + offset_x, y + offset_y),
                     line,
                     font=font,
-                    fill=_parse_color(spec.text_shadow_color),
+                    fill=shadow_fill,
                 )
             draw.text(
                 (x, y),
                 line,
                 font=font,
-                fill=_parse_color(spec.text_color),
-                stroke_width=spec.text_stroke_width,
-                stroke_fill=_parse_color(spec.text_stroke_color) if spec.text_stroke_color else None,
+                fill=text_fill,
+                stroke_width=stroke_width,
+                stroke_fill=stroke_fill,
             )
             y += line_height + line_gap
 
+    def _paste_shadowed_line(
+        self,
+        canvas: Image.Image,
+        line: str,
+        font: ImageFont.FreeTypeFont | ImageFont.ImageFont,
+        position: Tuple[int, int],
+        shadow_offset: Tuple[int, int],
+        text_fill: Tuple[int, ...],
+        shadow_fill: Tuple[int, ...],
+    ) -> bool:
+        """Rasterize ``line`` once and blend it twice (shadow, then fill).
+
+        ``Image.paste`` with the glyph coverage as the mask reproduces the
+        channel blend ``draw.text`` performs on an RGBA canvas, so the output
+        matches the two-pass drawing while running FreeType only once per
+        line. Returns True when the line was handled (including empty lines).
+        """
+        if not line:
+            return True
+        mask_key = (id(font), line)
+        cached = self._line_mask_cache.get(mask_key)
+        if cached is None:
+            bbox = self._measure_draw.textbbox((0, 0), line, font=font)
+            mask_left, mask_top = int(bbox[0]), int(bbox[1])
+            mask_width = int(math.ceil(bbox[2])) - mask_left
+            mask_height = int(math.ceil(bbox[3])) - mask_top
+            if mask_width <= 0 or mask_height <= 0:
+                return True
+            mask = Image.new("L", (mask_width, mask_height), 0)
+            ImageDraw.Draw(mask).text((-mask_left, -mask_top), line, font=font, fill=255)
+            if len(self._line_mask_cache) >= 256:
+                self._line_mask_cache.pop(next(iter(self._line_mask_cache)))
+            self._line_mask_cache[mask_key] = (mask, mask_left, mask_top)
+        else:
+            mask, mask_left, mask_top = cached
+        x, y = position
+        shadow_dest = (x + shadow_offset[0] + mask_left, y + shadow_offset[1] + mask_top)
+        fill_dest = (x + mask_left, y + mask_top)
+        canvas.paste(shadow_fill, shadow_dest, mask)
+        canvas.paste(text_fill, fill_dest, mask)
+        return True
+
     def _layout_text(
         self,
         text: str,
@@ -201,20 +503,47 @@ class StickerGenerator:
         base_font_size: int,
         line_spacing: float,
     ) -> Tuple[ImageFont.FreeTypeFont | ImageFont.ImageFont, List[str], int, int]:
-        size = base_font_size
-        min_size = max(20, base_font_size // 4)
-        while size >= min_size:
-            font = self._get_font(size)
-            lines = self._wrap_text(text, font, max_width)
-            line_height, line_gap, block_height, max_line_width = self._measure_block(lines, font, line_spacing)
+        cache_key = (text, max_width, max_height, base_font_size, line_spacing)
+        cached = self._layout_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        persisted = self._persist_layouts.get(cache_key)
+        if persisted is not None:
+            size, lines, line_height, line_gap = persisted
+            best = (self._get_font(size), lines, line_height, line_gap)
+            self._layout_cache[cache_key] = best
+            return best
+
+        # The 20px floor is denominated on the 4x reference canvas like every
+        # other pixel value, and may never exceed the requested size.
+        floor_size = max(1, round(20 * self.config.spec_scale))
+        min_size = min(base_font_size, max(floor_size, base_font_size // 4))
+        get_font = self._get_font
+        wrap_text = self._wrap_text
+        measure_block = self._measure_block
+        lo, hi = min_size, base_font_size
+        best: Optional[Tuple[ImageFont.FreeTypeFont | ImageFont.ImageFont, List[str], int, int]] = None
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            font = get_font(mid)
+            lines = wrap_text(text, font, max_width)
+            line_height, line_gap, block_height, max_line_width = measure_block(lines, font, line_spacing)
             if block_height <= max_height and max_line_width <= max_width:
-                return font, lines, line_height, line_gap
-            size -= 4
-
-        font = self._get_font(min_size)
-        lines = self._wrap_text(text, font, max_width)
-        line_height, line_gap, _, _ = self._measure_block(lines, font, line_spacing)
-        return font, lines, line_height, line_gap
+                best = (font, lines, line_height, line_gap)
+                lo = mid + 1
+            else:
+                hi = mid - 1
+        if best is None:
+            font = self._get_font(min_size)
+            lines = self._wrap_text(text, font, max_width)
+            line_height, line_gap, _, _ = self._measure_block(lines, font, line_spacing)
+            best = (font, lines, line_height, line_gap)
+        self._layout_cache[cache_key] = best
+        chosen_size = self._font_sizes.get(id(best[0]))
+        if chosen_size is not None:
+            self._persist_layouts[cache_key] = (chosen_size, best[1], best[2], best[3])
+            self._persist_dirty = True
+        return best
 
     def _measure_block(
         self,
@@ -225,7 +554,8 @@ class StickerGenerator:
         line_height = self._line_height(font)
         line_gap = max(0, int(math.floor(line_height * max(0.0, line_spacing - 1.0))))
         total_height = self._block_height(len(lines), line_height, line_gap)
-        max_width = max((self._text_length(line, font) for line in lines), default=0)
+        text_length = self._text_length
+        max_width = max((text_length(line, font) for line in lines), default=0)
         return line_height, line_gap, total_height, max_width
 
     @staticmethod
@@ -242,42 +572,52 @@ class StickerGenerator:
     ) -> List[str]:
         if not text:
             return [""]
+        if "\n" not in text and self._text_length(text, font) <= max_width:
+            return [text]
+        widths = {char: self._char_advance(font, char) for char in set(text) if char != "\n"}
+        segments = text.split("\n")
+        if len(segments) > 1 and not segments[-1]:
+            segments.pop()
         lines: List[str] = []
-        current = ""
-        for char in text:
-            if char == "\n":
-                lines.append(current)
-                current = ""
+        for segment in segments:
+            if not segment:
+                lines.append("")
                 continue
-            tentative = current + char
-            length = self._text_length(tentative, font)
-            if length <= max_width or not current:
-                current = tentative
-            else:
-                lines.append(current)
-                current = char
-        if current or not lines:
-            lines.append(current)
+            cumulative = list(accumulate(widths[char] for char in segment))
+            start = 0
+            total = len(segment)
+            while start < total:
+                limit = (cumulative[start - 1] if start else 0) + max_width
+                end = bisect_right(cumulative, limit, lo=start)
+                if end == start:  # single glyph wider than the box
+                    end = start + 1
+                lines.append(segment[start:end])
+                start = end
         return lines
 
     def _generate_set_icon(self, text: str) -> None:
         size = max(self.config.store_size)
-        base_size = size * self.config.scale_multiplier
-        canvas = Image.new("RGBA", (base_size, base_size), _parse_color(self.config.set_icon_background))
-        font_size = self.config.set_icon_font_size or max(48, int(base_size * 0.42))
+        canvas = Image.new("RGBA", (size, size), _parse_color(self.config.set_icon_background))
+        if self.config.set_icon_font_size:
+            # Configured values are denominated on the legacy supersampled
+            # canvas (store size x reference scale); the icon renders at
+            # target size, so map them down.
+            font_size = max(1, self.config.set_icon_font_size // _SPEC_REFERENCE_SCALE)
+        else:
+            font_size = max(24, int(size * 0.42))
         font, lines, line_height, line_gap = self._layout_text(
             text,
-            base_size - int(base_size * 0.2),
-            base_size - int(base_size * 0.2),
+            size - int(size * 0.2),
+            size - int(size * 0.2),
             font_size,
             1.1,
         )
         draw = ImageDraw.Draw(canvas)
         block_height = self._block_height(len(lines), line_height, line_gap)
-        y = (base_size - block_height) // 2
+        y = (size - block_height) // 2
         for line in lines:
             width = self._text_length(line, font)
-            x = (base_size - width) // 2
+            x = (size - width) // 2
             draw.text(
                 (x, y),
                 line,
@@ -286,29 +626,48 @@ class StickerGenerator:
             )
             y += line_height + line_gap
 
-        target_dir = self.output_dir / "set_icon"
-        target_dir.mkdir(parents=True, exist_ok=True)
-        store_size = (size, size)
-        set_icon_path = target_dir / "set_icon.png"
-        ImageOps.fit(canvas, store_size, Image.LANCZOS, centering=(0.5, 0.5)).save(set_icon_path)
+        set_icon_path = self._category_dirs["set_icon"] / "set_icon.png"
+        canvas.save(set_icon_path, format="PNG", compress_level=self.config.png_compress_level)
 
-    def _export_scaled(self, image: Image.Image, slug: str, category: str, size: Tuple[int, int]) -> None:
-        target_dir = self.output_dir / category
-        target_dir.mkdir(parents=True, exist_ok=True)
+    def _export_scaled(
+        self, image: Image.Image, slug: str, category: str, size: Tuple[int, int]
+    ) -> Optional[Image.Image]:
+        target_dir = self._category_dirs[category]
         if size[0] <= 0 or size[1] <= 0:
-            return
+            return None
 
         if not isinstance(size[0], int) or not isinstance(size[1], int):
             size = (int(size[0]), int(size[1]))
 
         resized = self._resize_for_target(image, size)
         output_path = target_dir / f"{slug}_{category}.png"
-        resized.save(output_path)
+        # The identity fast path can hand back the shared scratch canvas, which
+        # the next render repaints; snapshot it before saving off-thread.
+        to_save = resized.copy() if resized is image else resized
+        self._io_futures.append(
+            self._io_pool.submit(
+                to_save.save, output_path, format="PNG", compress_level=self.config.png_compress_level
+            )
+        )
+        return resized
 
     def _resize_for_target(self, image: Image.Image, size: Tuple[int, int]) -> Image.Image:
+        if size == image.size:
+            return image
         src_ratio = image.width / image.height
         target_ratio = size[0] / size[1]
         if abs(src_ratio - target_ratio) <= 0.01:
+            if (
+                image.width % size[0] == 0
+                and image.height % size[1] == 0
+                and image.width // size[0] == image.height // size[1]
+            ):
+                return image.resize(size, Image.BOX)
+            factor = min(image.width // size[0], image.height // size[1])
+            if factor >= 2:
+                # Same strategy as Image.thumbnail: cheap integer box-shrink
+                # first, then one small filtered pass to the exact size.
+                return image.reduce(factor).resize(size, Image.BICUBIC)
             return image.resize(size, Image.LANCZOS)
         return ImageOps.fit(image, size, Image.LANCZOS, centering=(0.5, 0.5))
 
@@ -323,46 +682,81 @@ class StickerGenerator:
     def _resolve_path(self, maybe_path: Optional[str | Path]) -> Path:
         if maybe_path is None:
             raise ValueError("Expected a path but received None")
+        cache_key = str(maybe_path)
+        cached = self._resolved_path_cache.get(cache_key)
+        if cached is not None:
+            return cached
         path = Path(maybe_path)
         if not path.is_absolute():
             path = (self.base_dir / path).resolve()
         if not path.exists():
             raise FileNotFoundError(f"Asset not found: {path}")
+        self._resolved_path_cache[cache_key] = path
         return path
 
     def _resolve_font_path(self) -> Optional[Path]:
         if self.config.font_path:
             path = self._resolve_path(self.config.font_path)
             return path
-        for candidate in DEFAULT_FONT_CANDIDATES:
-            if candidate.exists():
-                return candidate
-        return None
+        return _default_font_path()
 
     def _get_font(self, size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+        cached = self._font_cache.get(size)
+        if cached is not None:
+            return cached
         if self._font_path:
             try:
-                return ImageFont.truetype(str(self._font_path), size=size)
+                font = ImageFont.truetype(str(self._font_path), size=size)
             except OSError as exc:
                 raise RuntimeError(f"Failed to load font '{self._font_path}': {exc}") from exc
-        return ImageFont.load_default()
+        else:
+            font = ImageFont.load_default()
+        self._font_cache[size] = font
+        self._font_sizes[id(font)] = size
+        return font
+
+    def _char_advance(self, font: ImageFont.FreeTypeFont | ImageFont.ImageFont, char: str) -> int:
+        key = (id(font), char)
+        advance = self._advance_cache.get(key)
+        if advance is None:
+            advance = self._text_length(char, font)
+            self._advance_cache[key] = advance
+        return advance
 
     def _text_length(self, text: str, font: ImageFont.FreeTypeFont | ImageFont.ImageFont) -> int:
-        length = self._measure_draw.textlength(text, font=font)
-        return int(math.ceil(length))
+        key = (id(font), text)
+        cached = self._length_cache.get(key)
+        if cached is not None:
+            return cached
+        size = self._font_sizes.get(id(font))
+        length = self._persist_lengths.get((size, text)) if size is not None else None
+        if length is None:
+            length = int(math.ceil(self._measure_draw.textlength(text, font=font)))
+            if size is not None:
+                self._persist_lengths[(size, text)] = length
+                self._persist_dirty = True
+        if len(self._length_cache) >= self._LENGTH_CACHE_LIMIT:
+            self._length_cache.pop(next(iter(self._length_cache)))
+        self._length_cache[key] = length
+        return length
 
     def _line_height(self, font: ImageFont.FreeTypeFont | ImageFont.ImageFont) -> int:
+        cached = self._metrics_cache.get(id(font))
+        if cached is not None:
+            return cached
         try:
             ascent, descent = font.getmetrics()
-            return int(ascent + descent)
+            height = int(ascent + descent)
         except (AttributeError, TypeError):
             bbox = self._measure_draw.textbbox((0, 0), "Ag", font=font)
-            return bbox[3] - bbox[1]
+            height = bbox[3] - bbox[1]
+        self._metrics_cache[id(font)] = height
+        return height
+
     def _obtain_art_image(self, spec: StickerSpec) -> Optional[Image.Image]:
         if spec.image_path:
             path = self._resolve_path(spec.image_path)
-            with Image.open(path) as art:
-                return art.convert("RGBA")
+            return self._load_image(path).copy()
         if spec.illustration and spec.illustration.enabled:
             return self._render_illustration(spec.illustration)
         return None
@@ -370,9 +764,23 @@ class StickerGenerator:
     def _render_illustration(self, illustration: IllustrationSpec) -> Image.Image:
         base_size = int(min(self.config.base_size) * 0.55)
         base_size = max(base_size, 200)
-        if illustration.style.lower() == "cat":
-            return self._draw_cat_blob(illustration, base_size)
-        return self._draw_blob(illustration, base_size)
+        key = (
+            illustration.style,
+            illustration.face_color,
+            illustration.outline_color,
+            illustration.accent_color,
+            illustration.expression,
+            base_size,
+        )
+        cached = self._illustration_cache.get(key)
+        if cached is None:
+            if illustration.style.lower() == "cat":
+                cached = self._draw_cat_blob(illustration, base_size)
+            else:
+                cached = self._draw_blob(illustration, base_size)
+            self._illustration_cache[key] = cached
+        # Copy because _composite_art's thumbnail call mutates its input.
+        return cached.copy()
 
     def _draw_blob(self, illustration: IllustrationSpec, size: int) -> Image.Image:
         image = Image.new("RGBA", (size, size), (0, 0, 0, 0))
@@ -445,6 +853,8 @@ class StickerGenerator:
     ) -> None:
         outline = _parse_color(illustration.outline_color)
         accent = _parse_color(illustration.accent_color) if illustration.accent_color else outline
+        line_width = max(2, outline_width)
+        mouth_line_width = max(3, outline_width)
         eye_diameter = max(8, size // 9)
         eye_spacing = size // 5
         eye_y = int(size * 0.45)
@@ -459,7 +869,7 @@ class StickerGenerator:
                 draw.line(
                     (x - half, y, x + half, y + outline_width // 2),
                     fill=outline,
-                    width=max(2, outline_width),
+                    width=line_width,
                 )
             else:
                 draw.ellipse(
@@ -475,12 +885,12 @@ class StickerGenerator:
             draw.line(
                 (left_eye_center[0] - eye_diameter, eye_y - brow_offset, left_eye_center[0] + eye_diameter, eye_y - brow_offset // 2),
                 fill=outline,
-                width=max(2, outline_width),
+                width=line_width,
             )
             draw.line(
                 (right_eye_center[0] - eye_diameter, eye_y - brow_offset // 2, right_eye_center[0] + eye_diameter, eye_y - brow_offset),
                 fill=outline,
-                width=max(2, outline_width),
+                width=line_width,
             )
             draw_eye(left_eye_center)
             draw_eye(right_eye_center)
@@ -537,12 +947,12 @@ class StickerGenerator:
             draw.line(
                 (size // 2 - mouth_width, mouth_center_y, size // 2 + mouth_width, mouth_center_y + outline_width // 2),
                 fill=outline,
-                width=max(3, outline_width),
+                width=mouth_line_width,
             )
         elif expression == "sad":
-            draw.arc(mouth_box, start=start, end=end, fill=outline, width=max(3, outline_width))
+            draw.arc(mouth_box, start=start, end=end, fill=outline, width=mouth_line_width)
         else:
             if fill_chord:
-                draw.chord(mouth_box, start=start, end=end, fill=accent, outline=outline, width=max(3, outline_width))
+                draw.chord(mouth_box, start=start, end=end, fill=accent, outline=outline, width=mouth_line_width)
             else:
-                draw.arc(mouth_box, start=start, end=end, fill=outline, width=max(3, outline_width))
+                draw.arc(mouth_box, start=start, end=end, fill=outline, width=mouth_line_width)